@@ -0,0 +1,84 @@
+"""
+Compiled kernels for the xArm controller's P2P endpoint math.
+
+The RPY -> tool-axis-column -> normalize -> ±half-offset chain is pure
+numeric work, so it is compiled with Numba when available; the same
+function runs as plain Python otherwise. `HAS_NUMBA` tells callers which
+flavor they got (the compiled kernel also releases the GIL).
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except Exception:  # pragma: no cover - numba is optional
+    njit = None  # type: ignore
+    HAS_NUMBA = False
+
+
+def _compute_endpoints_impl(x: float, y: float, z: float,
+                            rx: float, ry: float, rz: float,
+                            is_radian: bool, col: int, half: float) -> np.ndarray:
+    """Build both P2P endpoints around a center pose in one pass.
+
+    Args:
+        x: Center TCP x in mm.
+        y: Center TCP y in mm.
+        z: Center TCP z in mm.
+        rx: Roll (units per `is_radian`).
+        ry: Pitch.
+        rz: Yaw.
+        is_radian: True if the angles are radians.
+        col: Rotation-matrix column of the tool axis (0, 1, or 2).
+        half: Half the peak-to-peak amplitude in mm.
+
+    Returns:
+        np.ndarray: (2, 6) array of [low, high] endpoint poses; orientation
+        columns keep the caller's original units.
+    """
+    if is_radian:
+        arx, ary, arz = rx, ry, rz
+    else:
+        arx = math.radians(rx)
+        ary = math.radians(ry)
+        arz = math.radians(rz)
+    cy, sy = math.cos(ary), math.sin(ary)
+    cz, sz = math.cos(arz), math.sin(arz)
+    # Closed-form column of Rz @ Ry @ Rx (intrinsic XYZ)
+    if col == 0:
+        fx, fy, fz = cz * cy, sz * cy, -sy
+    elif col == 1:
+        cx, sx = math.cos(arx), math.sin(arx)
+        fx, fy, fz = cz * sy * sx - sz * cx, sz * sy * sx + cz * cx, cy * sx
+    else:
+        cx, sx = math.cos(arx), math.sin(arx)
+        fx, fy, fz = cz * sy * cx + sz * sx, sz * sy * cx - cz * sx, cy * cx
+    norm = math.sqrt(fx * fx + fy * fy + fz * fz)
+    if norm < 1e-9:
+        norm = 1e-9
+    dx = half * fx / norm
+    dy = half * fy / norm
+    dz = half * fz / norm
+    out = np.empty((2, 6), dtype=np.float64)
+    out[0, 0] = x - dx
+    out[0, 1] = y - dy
+    out[0, 2] = z - dz
+    out[1, 0] = x + dx
+    out[1, 1] = y + dy
+    out[1, 2] = z + dz
+    out[0, 3] = rx
+    out[0, 4] = ry
+    out[0, 5] = rz
+    out[1, 3] = rx
+    out[1, 4] = ry
+    out[1, 5] = rz
+    return out
+
+
+if HAS_NUMBA:
+    compute_endpoints = njit(cache=True, fastmath=True, nogil=True)(_compute_endpoints_impl)
+else:
+    compute_endpoints = _compute_endpoints_impl
@@ -10,12 +10,37 @@ Rendering: Plotly for 3D visualization
 """
 
 import argparse
+import functools
+import io
+import math
 import numpy as np
 import gradio as gr
 import plotly.graph_objects as go
 import tempfile
+import time
 import os
 
+try:
+    from numba import njit, prange
+except Exception:  # pragma: no cover - numba is optional
+    njit = None  # type: ignore
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _hemi_kernel(radius, lats, lons, out):  # pragma: no cover - compiled
+        """Fill `out` (N*M, 3) with hemisphere points, one write per element."""
+        for i in prange(lats.size):
+            cl = math.cos(lats[i])
+            sl = math.sin(lats[i])
+            base = i * lons.size
+            for j in range(lons.size):
+                out[base + j, 0] = radius * cl * math.cos(lons[j])
+                out[base + j, 1] = radius * cl * math.sin(lons[j])
+                out[base + j, 2] = radius * sl
+else:
+    _hemi_kernel = None
+
 
 def generate_hemisphere_points(radius: float,
                                 lat_start: float,
@@ -36,20 +61,35 @@ def generate_hemisphere_points(radius: float,
         lon_step (float): Step size for longitude.
 
     Returns:
-        np.ndarray: Array of shape (N, 3) with 3D point coordinates.
+        np.ndarray: float32 array of shape (N, 3) with 3D point coordinates.
     """
-    lat_range = np.radians(np.arange(lat_start, lat_end + 1e-6, lat_step))
-    lon_range = np.radians(np.arange(lon_start, lon_end + 1e-6, lon_step))
+    # float32 end to end: halves memory/bandwidth and matches the PLY spec's
+    # 32-bit `property float` so binary export needs no cast. linspace with an
+    # exact sample count avoids arange's epsilon-dependent extra row and keeps
+    # the endpoints bit-reproducible for the lru_cache layer.
+    n_lat = max(1, int(round((lat_end - lat_start) / lat_step)) + 1)
+    n_lon = max(1, int(round((lon_end - lon_start) / lon_step)) + 1)
+    lat_range = np.radians(np.linspace(lat_start, lat_end, n_lat,
+                                       dtype=np.float32))
+    lon_range = np.radians(np.linspace(lon_start, lon_end, n_lon,
+                                       dtype=np.float32))
 
-    points = []
-    for lat in lat_range:
-        for lon in lon_range:
-            x = radius * np.cos(lat) * np.cos(lon)
-            y = radius * np.cos(lat) * np.sin(lon)
-            z = radius * np.sin(lat)
-            points.append([x, y, z])
+    if _hemi_kernel is not None:
+        # Numba path: writes straight into the output buffer, avoiding the
+        # full-grid temporaries of the broadcast version.
+        out = np.empty((lat_range.size * lon_range.size, 3), dtype=np.float32)
+        _hemi_kernel(np.float32(radius), lat_range, lon_range, out)
+        return out
 
-    return np.array(points)
+    lat = lat_range[:, None]
+    lon = lon_range[None, :]
+
+    cos_lat = np.cos(lat)
+    x = radius * cos_lat * np.cos(lon)
+    y = radius * cos_lat * np.sin(lon)
+    z = np.broadcast_to(radius * np.sin(lat), x.shape)
+
+    return np.stack([x, y, z], axis=-1).reshape(-1, 3)
 
 
 def plot_points_3d(points: np.ndarray) -> go.Figure:
@@ -61,55 +101,121 @@ def plot_points_3d(points: np.ndarray) -> go.Figure:
     Returns:
         go.Figure: Plotly figure object.
     """
-    fig = go.Figure(data=[
-        go.Scatter3d(
-            x=points[:, 0],
-            y=points[:, 1],
-            z=points[:, 2],
-            mode='markers',
-            marker=dict(size=3, color='blue')
-        )
-    ])
-    fig.update_layout(scene=dict(
-        xaxis_title='X',
-        yaxis_title='Y',
-        zaxis_title='Z'
-    ))
-    return fig
-
-
-def export_to_ply(points: np.ndarray) -> str:
-    """Export 3D points to a .ply file.
+    # Build the figure as a plain dict and skip Plotly's per-attribute
+    # validation, which dominates construction time for large point counts.
+    fig_dict = {
+        "data": [{
+            "type": "scatter3d",
+            "x": points[:, 0],
+            "y": points[:, 1],
+            "z": points[:, 2],
+            "mode": "markers",
+            "marker": {"size": 3, "color": "blue"},
+        }],
+        "layout": {
+            "scene": {
+                "xaxis": {"title": "X"},
+                "yaxis": {"title": "Y"},
+                "zaxis": {"title": "Z"},
+            }
+        },
+    }
+    return go.Figure(fig_dict, skip_invalid=True)
+
+
+def export_to_ply(points: np.ndarray, binary: bool = True) -> bytes:
+    """Serialize 3D points to PLY bytes.
 
     Args:
         points (np.ndarray): Array of shape (N, 3).
+        binary (bool): If True, emit binary little-endian PLY (smaller and
+            faster to parse). If False, emit ASCII PLY for debugging.
 
     Returns:
-        str: Path to the temporary .ply file.
+        bytes: Complete PLY file contents (header plus vertex data).
     """
+    fmt = "binary_little_endian" if binary else "ascii"
     header = f"""ply
-format ascii 1.0
+format {fmt} 1.0
 element vertex {len(points)}
 property float x
 property float y
 property float z
 end_header
 """
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".ply", mode="w") as f:
-        f.write(header)
-        for pt in points:
-            f.write(f"{pt[0]} {pt[1]} {pt[2]}\n")
-        return f.name
+    if binary:
+        payload = np.ascontiguousarray(points, dtype="<f4").tobytes()
+    else:
+        buf = io.BytesIO()
+        np.savetxt(buf, points, fmt="%g %g %g")
+        payload = buf.getvalue()
+    return header.encode("ascii") + payload
 
 
-def update_view(radius, lat_start, lat_end, lat_step,
-                lon_start, lon_end, lon_step):
+@functools.lru_cache(maxsize=8)
+def _cached_points(radius, lat_start, lat_end, lat_step,
+                   lon_start, lon_end, lon_step) -> np.ndarray:
+    """Memoized point generation keyed on the raw slider values."""
     points = generate_hemisphere_points(radius, lat_start, lat_end, lat_step,
                                         lon_start, lon_end, lon_step)
-    fig = plot_points_3d(points)
+    points.flags.writeable = False
+    return points
+
+
+# Cap on points handed to the WebGL scatter; the full cloud still goes to
+# the PLY export. Scatter3d interactivity degrades well before ~50k points.
+MAX_DISPLAY_POINTS = 20000
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_figure(radius, lat_start, lat_end, lat_step,
+                   lon_start, lon_end, lon_step) -> go.Figure:
+    """Memoized Plotly figure for the same slider values."""
+    points = _cached_points(radius, lat_start, lat_end, lat_step,
+                            lon_start, lon_end, lon_step)
+    if len(points) > MAX_DISPLAY_POINTS:
+        # Fixed seed keeps the displayed subsample stable across redraws.
+        idx = np.random.default_rng(0).choice(len(points), MAX_DISPLAY_POINTS,
+                                              replace=False)
+        points = points[idx]
+    return plot_points_3d(points)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_ply(radius, lat_start, lat_end, lat_step,
+                lon_start, lon_end, lon_step) -> bytes:
+    """Memoized PLY blob for the same slider values."""
+    return export_to_ply(_cached_points(radius, lat_start, lat_end, lat_step,
+                                        lon_start, lon_end, lon_step))
+
+
+# Single download file reused across Generate clicks; Gradio's File
+# component serves paths, so the in-memory blob is flushed here in one write.
+_download_path = os.path.join(tempfile.gettempdir(), "hemisphere_points.ply")
+
+
+# Identical Generate clicks landing within this window coalesce into one
+# result; changed slider values always recompute.
+_MIN_INTERVAL_S = 0.25
+_last_run = {"time": 0.0, "key": None, "result": None}
+
+
+def update_view(radius, lat_start, lat_end, lat_step,
+                lon_start, lon_end, lon_step):
+    now = time.monotonic()
+    key = (radius, lat_start, lat_end, lat_step, lon_start, lon_end, lon_step)
+    if (_last_run["result"] is not None and _last_run["key"] == key
+            and (now - _last_run["time"]) < _MIN_INTERVAL_S):
+        return _last_run["result"]
+    points = _cached_points(*key)
+    fig = _cached_figure(*key)
     count = len(points)
-    ply_path = export_to_ply(points)
-    return fig, count, ply_path
+    with open(_download_path, "wb") as f:
+        f.write(_cached_ply(*key))
+    _last_run["time"] = now
+    _last_run["key"] = key
+    _last_run["result"] = (fig, count, _download_path)
+    return _last_run["result"]
 
 
 def launch_gradio():
@@ -138,8 +244,11 @@ def launch_gradio():
                   lon_start, lon_end, lon_step]
 
         gr.Button("Generate").click(fn=update_view, inputs=inputs,
-                                     outputs=[plot, count_display, download_btn])
+                                     outputs=[plot, count_display, download_btn],
+                                     concurrency_limit=1,
+                                     show_progress="minimal")
 
+    demo.queue(max_size=2)
     demo.launch()
 
 
@@ -12,6 +12,7 @@ server bind/port options before launching the app.
 """
 from __future__ import annotations
 
+import functools
 import math
 import threading
 import time
@@ -20,17 +21,24 @@ from typing import Optional, Tuple, List
 
 import gradio as gr
 
-try:
-    from xarm.wrapper import XArmAPI  # type: ignore
-except Exception:  # pragma: no cover
-    XArmAPI = None  # type: ignore
 
-from xarm_controller_lib import XArmController
+# -------------------- Gradio App --------------------
+# Serializes UI handlers: Gradio may dispatch concurrent requests on worker
+# threads, and the shared controller's connect/teach/play transitions race
+# without it.
+_ui_lock = threading.RLock()
 
 
+@functools.lru_cache(maxsize=1)
+def _get_controller():
+    """Create the shared controller on first use.
 
-# -------------------- Gradio App --------------------
-_controller = XArmController()
+    Importing the controller library (and transitively the xArm SDK) is
+    deferred so that e.g. ``--help`` does not pay SDK import cost.
+    """
+    from xarm_controller_lib import XArmController
+
+    return XArmController()
 
 
 def ui_connect(ip: str) -> tuple[str, str, str]:
@@ -42,14 +50,16 @@ def ui_connect(ip: str) -> tuple[str, str, str]:
     Returns:
         Tuple of (status, connection badge, teach status badge).
     """
-    status = _controller.connect(ip)
-    conn_badge = (
-        f"Connected ({_controller.state.sdk_version or 'SDK'})"
-        if _controller.state.connected
-        else "Disconnected"
-    )
-    teach_badge = "Draggable" if _controller.state.teach_enabled else "Not Draggable"
-    return status, conn_badge, teach_badge
+    with _ui_lock:
+        _controller = _get_controller()
+        status = _controller.connect(ip)
+        conn_badge = (
+            f"Connected ({_controller.state.sdk_version or 'SDK'})"
+            if _controller.state.connected
+            else "Disconnected"
+        )
+        teach_badge = "Draggable" if _controller.state.teach_enabled else "Not Draggable"
+        return status, conn_badge, teach_badge
 
 
 def ui_disconnect() -> tuple[str, str, str]:
@@ -58,7 +68,8 @@ def ui_disconnect() -> tuple[str, str, str]:
     Returns:
         Tuple of (status, connection badge, teach status badge).
     """
-    status = _controller.disconnect()
+    with _ui_lock:
+        status = _get_controller().disconnect()
     return status, "Disconnected", "Not Draggable"
 
 
@@ -68,7 +79,8 @@ def ui_toggle_teach() -> tuple[str, str]:
     Returns:
         A tuple of (status_text, draggable_label).
     """
-    status, label = _controller.toggle_teach()
+    with _ui_lock:
+        status, label = _get_controller().toggle_teach()
     return status, label
 
 
@@ -82,7 +94,8 @@ def ui_play(amplitude_cm: float, speed_percent: float, accel_percent: float) ->
     Returns:
         Status string.
     """
-    return _controller.play_point_to_point(amplitude_cm, speed_percent, accel_percent)
+    with _ui_lock:
+        return _get_controller().play_point_to_point(amplitude_cm, speed_percent, accel_percent)
 
 
 def ui_stop() -> str:
@@ -91,7 +104,8 @@ def ui_stop() -> str:
     Returns:
         Status string.
     """
-    return _controller.stop_motion()
+    with _ui_lock:
+        return _get_controller().stop_motion()
 
 
 def build_interface(default_ip: str = "192.168.1.221") -> gr.Blocks:
@@ -13,7 +13,8 @@ default robot IP, and trajectory filename before launching the app.
 from __future__ import annotations
 
 import argparse
-import math
+import array
+import queue
 import threading
 import time
 from dataclasses import dataclass
@@ -21,17 +22,39 @@ from typing import Optional, Tuple, List
 
 import gradio as gr
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore
+
 try:
     from xarm.wrapper import XArmAPI
 except Exception:  # pragma: no cover
     XArmAPI = None  # type: ignore
 
+try:
+    from numba import njit
+except Exception:  # pragma: no cover - numba is optional
+    njit = None  # type: ignore
+if np is None:
+    njit = None  # numba path needs numpy buffers
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _motion_kernel(q_new, q_last):  # pragma: no cover - compiled
+        """Return (squared joint-delta norm, max abs joint delta)."""
+        dq = q_new - q_last
+        return dq @ dq, np.max(np.abs(dq))
+else:
+    _motion_kernel = None
+
 
 # ------------------------------
 # Configuration Dataclasses
 # ------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class DetectConfig:
     """
     Parameters for movement-based record detection.
@@ -47,7 +70,7 @@ class DetectConfig:
     report_hz: float = 100.0
 
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     """
     Mutable state shared with the UI.
@@ -88,22 +111,64 @@ class XArmGradioController:
 
     def __init__(self, detect_cfg: DetectConfig) -> None:
         self.detect_cfg = detect_cfg
+        # Precomputed thresholds so the report callback compares squared
+        # distances instead of taking a sqrt per report.
+        self._motion_thresh_sq = detect_cfg.motion_threshold ** 2
+        self._motion_thresh_maxabs = detect_cfg.motion_threshold * 0.6
         self.arm: Optional[XArmAPI] = None
         self.state = AppState()
         self._cb_registered = False
         self._lock = threading.RLock()
-
-        # Motion detection variables
-        self._last_q: Optional[List[float]] = None
+        # Set whenever last_status changes so pollers can skip quiet ticks
+        self._status_dirty = threading.Event()
+        # Lock-free mirrors of teach/recording flags for the callback path;
+        # Event.is_set() is atomic, so _on_report never touches the RLock
+        self._teach_evt = threading.Event()
+        self._rec_evt = threading.Event()
+        # Non-blocking reentry guard: overlapping report bursts are dropped
+        # rather than serialized
+        self._cb_lock = threading.Lock()
+
+        # Motion detection variables. Buffers are allocated on the first
+        # report (joint count depends on the arm model) and reused after.
+        self._last_q: Optional[np.ndarray] = None
+        self._dq: Optional[np.ndarray] = None
+        self._q_scratch: Optional[np.ndarray] = None
         self._last_motion_t: float = 0.0
+        # Monotonic clock, pre-bound: immune to wall-clock jumps and avoids
+        # an attribute lookup per report
+        self._now = time.monotonic
+
+        # Report key that carried the joint vector on the first successful
+        # report; skips the three failed dict lookups per report thereafter
+        self._q_key: Optional[str] = None
 
         # Recording flags
         self._record_started = False
+        # Record methods, bound once at teach-mode entry so the callback
+        # avoids SDK attribute resolution per transition
+        self._start_record = None
+        self._stop_record = None
 
         # Playback control
         self._play_thread: Optional[threading.Thread] = None
         self._stop_play_evt = threading.Event()
 
+        # Worker queue for SDK calls issued from the report callback; the
+        # callback must never block on controller round-trips
+        self._cmd_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._cmd_worker: Optional[threading.Thread] = None
+
+        # Capability flags probed once at connect; hasattr per call is a
+        # try/except round through the SDK's attribute machinery
+        self._caps: dict = {}
+        self._set_teach_sens = None
+
+        # Last mode/state written, so redundant controller round-trips can
+        # be skipped; None means unknown
+        self._cur_mode: Optional[int] = None
+        self._cur_state: Optional[int] = None
+
     # ---- connection ----
 
     def connect(self, ip: str) -> Tuple[str, bool]:
@@ -126,21 +191,40 @@ class XArmGradioController:
                 arm = XArmAPI(ip, is_radian=True)
                 self.arm = arm
                 self.state.ip = ip
+                # Probe optional capabilities once per session
+                self._caps = {
+                    "teach_sens": hasattr(arm, "set_teach_sensitivity"),
+                    "save_conf": hasattr(arm, "save_conf"),
+                }
+                self._set_teach_sens = (
+                    arm.set_teach_sensitivity if self._caps["teach_sens"] else None
+                )
                 # Bringup
                 arm.motion_enable(True)
-                arm.set_mode(0)
-                arm.set_state(0)
+                self._cur_mode = None
+                self._cur_state = None
+                self._set_mode(0)
+                self._set_state(0)
                 # Collision sensitivity default
                 try:
                     arm.set_collision_sensitivity(self.state.collision_sensitivity)
                 except Exception:
                     pass
                 # Optional teach sensitivity
-                if hasattr(arm, "set_teach_sensitivity"):
+                if self._set_teach_sens is not None:
                     try:
-                        arm.set_teach_sensitivity(self.state.teach_sensitivity)
+                        self._set_teach_sens(self.state.teach_sensitivity)
                     except Exception:
                         pass
+                # Warm the JIT kernel so the first real report doesn't pay
+                # compile latency on the SDK callback thread
+                if _motion_kernel is not None:
+                    dummy = np.zeros(7, dtype=np.float64)
+                    _motion_kernel(dummy, dummy)
+                if self._cmd_worker is None or not self._cmd_worker.is_alive():
+                    self._cmd_worker = threading.Thread(
+                        target=self._command_worker, name="sdk-commands", daemon=True)
+                    self._cmd_worker.start()
                 self.state.connected = True
                 self.state.last_status = "connected"
                 return ("connected", True)
@@ -172,8 +256,8 @@ class XArmGradioController:
                 self._cb_registered = False
             if self.arm is not None and self.state.teach_mode:
                 try:
-                    self.arm.set_mode(0)
-                    self.arm.set_state(0)
+                    self._set_mode(0)
+                    self._set_state(0)
                 except Exception:
                     pass
             try:
@@ -182,10 +266,22 @@ class XArmGradioController:
             except Exception:
                 pass
             finally:
+                # Only retire a worker that was actually started; an orphaned
+                # sentinel would be consumed by the next connect's worker,
+                # killing it immediately
+                if self._cmd_worker is not None:
+                    self._cmd_q.put(None)
+                    self._cmd_worker = None
                 self.arm = None
+                self._start_record = None
+                self._stop_record = None
+                self._caps = {}
+                self._set_teach_sens = None
+                self._cur_mode = None
+                self._cur_state = None
                 self.state.connected = False
-                self.state.teach_mode = False
-                self.state.recording = False
+                self._set_teach(False)
+                self._set_recording(False)
                 self.state.last_status = "disconnected"
                 return ("disconnected", False)
 
@@ -206,11 +302,13 @@ class XArmGradioController:
                 return "not connected"
             try:
                 if enable:
-                    self.arm.set_mode(2)
-                    self.arm.set_state(0)
+                    self._set_mode(2)
+                    self._set_state(0)
+                    self._start_record = self.arm.start_record_trajectory
+                    self._stop_record = self.arm.stop_record_trajectory
                     self._ensure_report_callback()
-                    self.state.teach_mode = True
-                    self.state.last_status = "waiting"
+                    self._set_teach(True)
+                    self._set_status("waiting")
                 else:
                     if self.state.recording:
                         try:
@@ -218,18 +316,18 @@ class XArmGradioController:
                             self.arm.stop_record_trajectory(filename=None)
                         except Exception:
                             pass
-                        self.state.recording = False
+                        self._set_recording(False)
                         self._record_started = False
-                    self.arm.set_mode(0)
-                    self.arm.set_state(0)
+                    self._set_mode(0)
+                    self._set_state(0)
                     if self._cb_registered:
                         try:
                             self.arm.register_report_callback(lambda *_args, **_kw: None)
                         except Exception:
                             pass
                         self._cb_registered = False
-                    self.state.teach_mode = False
-                    self.state.last_status = "idle"
+                    self._set_teach(False)
+                    self._set_status("idle")
                 return self.state.last_status
             except Exception as e:
                 return f"teach toggle failed: {e}"
@@ -253,7 +351,7 @@ class XArmGradioController:
             try:
                 code = self.arm.set_collision_sensitivity(level)
                 self.state.collision_sensitivity = level
-                if hasattr(self.arm, "save_conf"):
+                if self._caps.get("save_conf"):
                     try:
                         self.arm.save_conf()
                     except Exception:
@@ -278,10 +376,10 @@ class XArmGradioController:
             if self.arm is None:
                 return "not connected"
             level = max(0, min(5, int(level)))
-            if not hasattr(self.arm, "set_teach_sensitivity"):
+            if self._set_teach_sens is None:
                 return "teach sensitivity unsupported"
             try:
-                code = self.arm.set_teach_sensitivity(level)
+                code = self._set_teach_sens(level)
                 self.state.teach_sensitivity = level
                 return f"teach_sens:{level} (code {code})"
             except Exception as e:
@@ -325,6 +423,54 @@ class XArmGradioController:
 
     # ---- internals ----
 
+    def _set_mode(self, mode: int) -> None:
+        """Write the controller mode only when it differs from the last write."""
+        if self._cur_mode != mode and self.arm is not None:
+            self.arm.set_mode(mode)
+            self._cur_mode = mode
+
+    def _set_state(self, state: int) -> None:
+        """Write the controller state only when it differs from the last write."""
+        if self._cur_state != state and self.arm is not None:
+            self.arm.set_state(state)
+            self._cur_state = state
+
+    def _set_teach(self, on: bool) -> None:
+        """Flip the teach flag and its lock-free mirror together."""
+        self.state.teach_mode = on
+        if on:
+            self._teach_evt.set()
+        else:
+            self._teach_evt.clear()
+
+    def _set_recording(self, on: bool) -> None:
+        """Flip the recording flag and its lock-free mirror together."""
+        self.state.recording = on
+        if on:
+            self._rec_evt.set()
+        else:
+            self._rec_evt.clear()
+
+    def _command_worker(self) -> None:
+        """Drain queued (call, fail_status) pairs; a None sentinel ends the worker.
+
+        When a call raises, its fail_status (if any) is published so the UI
+        doesn't keep showing the optimistic state set by the callback.
+        """
+        for job in iter(self._cmd_q.get, None):
+            fn, fail_status = job
+            try:
+                fn()
+            except Exception:
+                if fail_status is not None:
+                    self._set_status(fail_status)
+
+    def _set_status(self, status: str) -> None:
+        """Publish a status string only when it changes."""
+        if self.state.last_status != status:
+            self.state.last_status = status
+            self._status_dirty.set()
+
     def _ensure_report_callback(self) -> None:
         arm = self.arm
         if arm is None:
@@ -337,6 +483,10 @@ class XArmGradioController:
         except Exception:
             self._cb_registered = False
 
+    # Slider values (0-5 in 0.1 steps) pre-snapped to double_speed {1,2,4};
+    # index is int(ui_speed * 10)
+    _DS_LUT = tuple(4 if s >= 30 else 2 if s >= 15 else 1 for s in range(51))
+
     @staticmethod
     def _snap_double_speed(ui_speed: float) -> int:
         """
@@ -348,11 +498,7 @@ class XArmGradioController:
         Returns:
             One of 1, 2, 4.
         """
-        if ui_speed >= 3.0:
-            return 4
-        if ui_speed >= 1.5:
-            return 2
-        return 1
+        return XArmGradioController._DS_LUT[min(50, max(0, int(ui_speed * 10)))]
 
     def _on_report(self, data: dict) -> None:
         """
@@ -361,73 +507,121 @@ class XArmGradioController:
         Args:
             data: Report dictionary from SDK. Expected keys include 'angles'.
         """
+        if not self._cb_lock.acquire(blocking=False):
+            # overlapping callback; dropping it is the right semantic for a
+            # monitoring stream
+            return
         try:
-            # accept multiple possible keys from SDK variants
-            q = (data.get("angles") or
-                 data.get("joint_angles") or
-                 data.get("angle") or
-                 data.get("joints"))
+            # Hoist hot attributes into locals; this callback runs at up to
+            # report_hz on the SDK thread.
+            state = self.state
+            # snapshot the arm reference once; disconnect may null it at any
+            # time and the callback must not race through self.arm twice
+            arm = self.arm
+            if arm is None:
+                return
+            # accept multiple possible keys from SDK variants; once a key has
+            # matched, use it alone on subsequent reports
+            q_key = self._q_key
+            if q_key is not None:
+                q = data.get(q_key)
+            else:
+                q = None
+                for key in ("angles", "joint_angles", "angle", "joints"):
+                    q = data.get(key)
+                    if q:
+                        self._q_key = key
+                        break
             if not q:
                 return
-            now = time.time()
+            now = self._now()
             moved = False
 
-            if self._last_q is not None:
-                # Euclidean norm of joint deltas
-                dq2 = 0.0
-                for a, b in zip(q, self._last_q):
-                    d = float(a) - float(b)
-                    dq2 += d * d
-                # if report rate is high, per-tick deltas can be tiny; also check max-abs per joint
-                dist = math.sqrt(dq2)
-                max_abs = max(abs(float(a) - float(b)) for a, b in zip(q, self._last_q))
-                moved = (dist >= self.detect_cfg.motion_threshold) or (max_abs >= (self.detect_cfg.motion_threshold * 0.6))
-
-            self._last_q = list(q)
-
-            if not self.state.teach_mode:
-                # reflect idle when not teaching
-                self.state.last_status = "idle"
+            if np is not None:
+                scratch = self._q_scratch
+                n = len(q)
+                if scratch is None or scratch.shape[0] != n:
+                    scratch = np.empty(n, dtype=np.float64)
+                    self._dq = np.empty(n, dtype=np.float64)
+                    self._last_q = None
+                scratch[:] = q
+                if self._last_q is not None:
+                    # Squared Euclidean norm of joint deltas. If report rate
+                    # is high, per-tick deltas can be tiny; also check
+                    # max-abs per joint.
+                    if _motion_kernel is not None:
+                        dq2, max_abs = _motion_kernel(scratch, self._last_q)
+                    else:
+                        np.subtract(scratch, self._last_q, out=self._dq)
+                        dq2 = self._dq @ self._dq
+                        max_abs = np.abs(self._dq).max()
+                    moved = (dq2 >= self._motion_thresh_sq) or (max_abs >= self._motion_thresh_maxabs)
+                    # double-buffer: the old last_q becomes next report's scratch
+                    self._last_q, self._q_scratch = scratch, self._last_q
+                else:
+                    self._last_q = scratch
+                    self._q_scratch = np.empty(n, dtype=np.float64)
+            else:
+                # Pure-Python fallback: one fused pass computes both the
+                # squared norm and the max-abs delta. The previous vector is
+                # held in a typed array.array('d') buffer, which stores raw
+                # doubles instead of boxed floats.
+                last = self._last_q
+                if last is not None and len(last) == len(q):
+                    dq2 = 0.0
+                    max_abs = 0.0
+                    for a, b in zip(q, last):
+                        d = float(a) - float(b)
+                        ad = -d if d < 0.0 else d
+                        if ad > max_abs:
+                            max_abs = ad
+                        dq2 += d * d
+                    moved = (dq2 >= self._motion_thresh_sq) or (max_abs >= self._motion_thresh_maxabs)
+                    last[:] = array.array('d', q)
+                else:
+                    self._last_q = array.array('d', q)
+
+            if not self._teach_evt.is_set():
+                # nothing to publish when not teaching; the UI already shows
+                # idle and writing it 100x/s would only churn the poller
                 return
 
             if moved:
                 self._last_motion_t = now
                 if not self._record_started:
-                    try:
-                        if self.arm is not None:
-                            self.arm.start_record_trajectory()
-                        self.state.recording = True
-                        self._record_started = True
-                        self.state.last_status = "recording"
-                    except Exception:
-                        self.state.last_status = "record:start failed"
+                    # The status is set optimistically; the worker publishes
+                    # the failure status if the SDK call raises
+                    start_record = self._start_record
+                    if start_record is not None:
+                        self._cmd_q.put((start_record, "record:start failed"))
+                    self._set_recording(True)
+                    self._record_started = True
+                    self._set_status("recording")
             else:
                 if self._record_started and (now - self._last_motion_t) >= self.detect_cfg.idle_timeout:
-                    # Attempt atomic stop+save
-                    try:
-                        if self.arm is not None:
-                            self.arm.stop_record_trajectory(filename=self.state.traj_filename)
-                        self.state.recording = False
-                        self._record_started = False
-                        self.state.last_status = "idle"
-                    except Exception:
-                        self.state.last_status = "record:save failed"
-                    # Auto-exit teach mode after saving attempt
-                    try:
-                        if self.arm is not None:
-                            self.arm.set_mode(0)
-                            self.arm.set_state(0)
-                            if self._cb_registered:
-                                try:
-                                    self.arm.register_report_callback(lambda *_args, **_kw: None)
-                                except Exception:
-                                    pass
-                                self._cb_registered = False
-                        self.state.teach_mode = False
-                    except Exception:
-                        pass
+                    # Attempt atomic stop+save off-thread
+                    stop_record = self._stop_record
+                    if stop_record is not None:
+                        filename = state.traj_filename
+                        self._cmd_q.put((lambda: stop_record(filename=filename),
+                                         "record:save failed"))
+                    self._set_recording(False)
+                    self._record_started = False
+                    self._set_status("idle")
+                    # Auto-exit teach mode after saving attempt; mode/state
+                    # writes are round-trips, so run them on the worker too
+                    if arm is not None:
+                        def _exit_teach(arm=arm):
+                            self._set_mode(0)
+                            self._set_state(0)
+                            arm.register_report_callback(lambda *_args, **_kw: None)
+                        self._cmd_q.put((_exit_teach, None))
+                        self._cb_registered = False
+                    self._set_teach(False)
         except Exception:
             pass
+        finally:
+            self._cb_lock.release()
 
     def _playback_loop(self) -> None:
         arm = self.arm
@@ -436,30 +630,48 @@ class XArmGradioController:
         filename = self.state.traj_filename
         double_speed = self._snap_double_speed(self.state.playback_speed)
 
-        # Ensure not in teach and preload the trajectory
+        # Ensure not in teach and preload the trajectory; when the preload
+        # succeeds, playback can pass filename=None and reuse the loaded
+        # trajectory instead of re-resolving the file per iteration. The SDK
+        # reports load failure via a nonzero return code, not an exception,
+        # so only a code-0 preload drops the filename.
+        pb_filename: Optional[str] = filename
         try:
-            arm.set_mode(0)
-            arm.set_state(0)
-            arm.load_trajectory(filename)
+            self._set_mode(0)
+            self._set_state(0)
+            if arm.load_trajectory(filename) == 0:
+                pb_filename = None
         except Exception:
             # If preload fails, loop will attempt playback anyway
             pass
 
-        while not self._stop_play_evt.is_set():
+        # Pre-bind the per-iteration callables; the blocking
+        # playback_trajectory(wait=True) already gates CPU, so the
+        # inter-iteration check is non-blocking rather than a 50 ms sleep.
+        pb = arm.playback_trajectory
+        stop_wait = self._stop_play_evt.wait
+        while not stop_wait(0.0):
             try:
-                # Blocking single playback iteration
-                arm.playback_trajectory(times=1, filename=filename, wait=True, double_speed=double_speed)
+                # Blocking single playback iteration; the SDK rejects bad
+                # requests (nothing loaded, NOT_READY) via a nonzero code
+                # rather than an exception, so back off on either to avoid
+                # busy-spinning controller round-trips
+                code = pb(times=1, filename=pb_filename, wait=True, double_speed=double_speed)
+                if code != 0 and stop_wait(0.2):
+                    break
             except Exception:
                 # Backoff if controller rejects the request
-                if self._stop_play_evt.wait(0.2):
+                if stop_wait(0.2):
                     break
-            # Allow responsive stop between iterations
-            if self._stop_play_evt.wait(0.05):
-                break
 
-        # Attempt to leave the controller in motion-ready state
+        # Attempt to leave the controller in motion-ready state; playback
+        # moves both the controller state and the mode underneath us (the
+        # firmware runs playback in mode 11 and skips restoring mode 0 when
+        # aborted), so both caches are dropped to force the next writes
         try:
-            arm.set_state(0)
+            self._cur_mode = None
+            self._cur_state = None
+            self._set_state(0)
         except Exception:
             pass
 
@@ -509,17 +721,21 @@ def build_ui(ctrl: XArmGradioController) -> gr.Blocks:
 
         status = gr.Textbox(label="Status", value=ctrl.state.last_status)
 
-        # periodic UI poll to reflect backend state (waiting/recording/idle and teach toggle)
-        def _poll():
-            if ctrl.state.teach_mode:
-                s = "recording" if ctrl.state.recording else "waiting"
-            else:
-                s = "idle"
-            ctrl.state.last_status = s
-            return s, ctrl.state.teach_mode, ("teach:on" if ctrl.state.teach_mode else "teach:off")
+        # event-driven UI updates: block on the dirty flag and only emit when
+        # backend state actually changed (2 s timeout keeps the stream alive)
+        def _status_stream():
+            while True:
+                ctrl._status_dirty.wait(timeout=2.0)
+                ctrl._status_dirty.clear()
+                if ctrl.state.teach_mode:
+                    s = "recording" if ctrl.state.recording else "waiting"
+                else:
+                    s = "idle"
+                ctrl.state.last_status = s
+                yield (s, ctrl.state.teach_mode,
+                       ("teach:on" if ctrl.state.teach_mode else "teach:off"))
 
-        timer = gr.Timer(0.5)
-        timer.tick(_poll, None, [status, teach_toggle, teach_state])
+        demo.load(_status_stream, None, [status, teach_toggle, teach_state])
 
         # ---- wiring ----
         def _on_connect(ip: str):
@@ -40,20 +40,59 @@ def is_admin():
 
 
 def run_as_admin():
-    """Relaunch the script with administrative privileges using a temporary VBS script."""
+    """Relaunch the script with administrative privileges via ShellExecuteW.
+
+    Calling the shell API directly avoids spawning a cscript host and
+    writing a throwaway VBS file to %TEMP% on every elevation.
+    """
     script_path = os.path.abspath(sys.argv[0])
     params = ' '.join([f'"{arg}"' for arg in sys.argv[1:]])
-    vbs_content = f'''
-Set UAC = CreateObject("Shell.Application")
-UAC.ShellExecute "pythonw.exe", "\"{script_path}\" {params}", "", "runas", 1
-'''
-    vbs_path = os.path.join(os.environ['TEMP'], 'elevate.vbs')
-    with open(vbs_path, 'w') as vbs_file:
-        vbs_file.write(vbs_content)
-    subprocess.call(['cscript', '//nologo', vbs_path])
+    ctypes.windll.shell32.ShellExecuteW(
+        None, "runas", sys.executable, f'"{script_path}" {params}', None, 1
+    )
     sys.exit(0)
 
 
+def _toggle_ethernet_wmi(interface_name: str, wait_seconds: int) -> bool:
+    """
+    Toggle the interface in-process via WMI, avoiding two netsh spawns.
+
+    Args:
+        interface_name (str): Name of the interface to toggle.
+        wait_seconds (int): Seconds to wait between disable and enable.
+
+    Returns:
+        bool: True if the WMI path completed, False to fall back to netsh.
+    """
+    try:
+        import wmi
+    except ImportError:
+        return False
+    try:
+        conn = wmi.WMI()
+        nics = [n for n in conn.Win32_NetworkAdapter()
+                if n.NetConnectionID == interface_name]
+        if not nics:
+            return False
+        nic = nics[0]
+        # Disable()/Enable() report failure via a nonzero result code in the
+        # returned tuple, not an exception
+        print(f"Disabling interface: {interface_name} (WMI)...")
+        if nic.Disable()[0] != 0:
+            print("WMI disable failed; falling back to netsh.")
+            return False
+        print(f"Waiting {wait_seconds} seconds...")
+        time.sleep(wait_seconds)
+        print(f"Enabling interface: {interface_name} (WMI)...")
+        if nic.Enable()[0] != 0:
+            print("WMI enable failed; falling back to netsh.")
+            return False
+        print("Interface reset completed.")
+        return True
+    except Exception:
+        return False
+
+
 def toggle_ethernet(interface_name: str, wait_seconds: int = 3):
     """
     Disable and re-enable the specified Ethernet interface using netsh.
@@ -65,18 +104,21 @@ def toggle_ethernet(interface_name: str, wait_seconds: int = 3):
     Raises:
         subprocess.CalledProcessError: If netsh commands fail.
     """
+    if _toggle_ethernet_wmi(interface_name, wait_seconds):
+        return
+    no_window = getattr(subprocess, "CREATE_NO_WINDOW", 0)
     print(f"Disabling interface: {interface_name}...")
-    subprocess.check_call([
+    subprocess.run([
         "netsh", "interface", "set", "interface",
         interface_name, "admin=disabled"
-    ])
+    ], check=True, creationflags=no_window)
     print(f"Waiting {wait_seconds} seconds...")
     time.sleep(wait_seconds)
     print(f"Enabling interface: {interface_name}...")
-    subprocess.check_call([
+    subprocess.run([
         "netsh", "interface", "set", "interface",
         interface_name, "admin=enabled"
-    ])
+    ], check=True, creationflags=no_window)
     print("Interface reset completed.")
 
 
@@ -17,17 +17,32 @@ starting pose, with all operations reporting concise status strings for a Gradio
 """
 
 import math
+import queue
+import sys
 import threading
 from dataclasses import dataclass
 from typing import Optional, Tuple, List, Literal
 
 import gradio as gr
+import numpy as np
 
 try:
     from xarm.wrapper import XArmAPI  # type: ignore
 except Exception:  # pragma: no cover
     XArmAPI = None  # type: ignore
 
+try:
+    from scipy.spatial.transform import Rotation as _Rotation
+except Exception:  # pragma: no cover - scipy is optional
+    _Rotation = None  # type: ignore
+
+try:
+    from _rpy_kernels import compute_endpoints as _compute_endpoints
+    from _rpy_kernels import HAS_NUMBA as _KERNEL_COMPILED
+except ImportError:  # pragma: no cover
+    _compute_endpoints = None  # type: ignore
+    _KERNEL_COMPILED = False
+
 from xarm_state_lib import ArmState
 
 AxisLiteral = Literal["x", "y", "z"]
@@ -35,6 +50,12 @@ AxisLiteral = Literal["x", "y", "z"]
 SPEED_MULTIPLIER = 4.0
 ACCEL_MULTIPLIER = 4.0
 
+# True on free-threaded (no-GIL) CPython 3.13+ builds. The motion setup math
+# is NumPy-based so it releases the GIL either way, but on free-threaded
+# builds the motion thread and Gradio's request threads genuinely overlap,
+# so stop paths don't need generous join windows to cover GIL contention.
+_FREE_THREADED = hasattr(sys, "_is_gil_enabled") and not sys._is_gil_enabled()
+
 class XArmController:
     """
     Thin controller for uFactory xArm 850 used by the Gradio app.
@@ -49,9 +70,33 @@ class XArmController:
     def __init__(self) -> None:
         self._arm: Optional[XArmAPI] = None
         self.state = ArmState()
-        self._lock = threading.RLock()
+        # Plain Lock: no method re-enters it (stop_motion/toggle_teach are
+        # split into phases that release before calling back in)
+        self._lock = threading.Lock()
         self._stop_event = threading.Event()
-        self._motion_thread: Optional[threading.Thread] = None
+        # Lock-free mirrors of the connected/playing flags; Event.is_set()
+        # is atomic, so read-only fast paths skip the lock entirely
+        self._connected_event = threading.Event()
+        self._playing_event = threading.Event()
+        # Persistent motion worker fed by a job queue; amortizes thread
+        # startup across Play/Stop cycles. A None job retires the worker.
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        # Set while the worker is between jobs; stop_motion waits on it
+        # instead of joining the (persistent) worker thread
+        self._loop_idle = threading.Event()
+        self._loop_idle.set()
+        # Optional SDK capabilities, probed once per connect; None when the
+        # running SDK lacks the method
+        self._cap_err_warn = None
+        self._cap_clean_error = None
+        self._cap_clean_warn = None
+        # Bound SDK methods, resolved once per connect so the motion/stop
+        # paths skip per-call attribute dispatch on the arm object
+        self._sdk_set_position = None
+        self._sdk_set_mode = None
+        self._sdk_set_state = None
+        self._sdk_get_position = None
 
     # -------------------- Helpers --------------------
     def _check(self, code: int, ok_msg: str = "OK", fail_msg: str = "Error") -> Tuple[bool, str]:
@@ -68,22 +113,23 @@ class XArmController:
         """
         if code == 0:
             return True, ok_msg
-        # Attempt to fetch and clean error/warn codes where possible
+        # Attempt to fetch and clean error/warn codes where possible, using
+        # the capabilities probed at connect
         extra = []
         try:
-            if self._arm is not None and hasattr(self._arm, "get_err_warn_code"):
-                _c, err, warn = self._arm.get_err_warn_code()  # type: ignore[attr-defined]
+            if self._cap_err_warn is not None:
+                _c, err, warn = self._cap_err_warn()
                 extra.append(f"err={err}")
                 extra.append(f"warn={warn}")
                 # Best-effort cleanup
-                if hasattr(self._arm, "clean_error"):
+                if self._cap_clean_error is not None:
                     try:
-                        self._arm.clean_error()  # type: ignore[attr-defined]
+                        self._cap_clean_error()
                     except Exception:
                         pass
-                if hasattr(self._arm, "clean_warn"):
+                if self._cap_clean_warn is not None:
                     try:
-                        self._arm.clean_warn()  # type: ignore[attr-defined]
+                        self._cap_clean_warn()
                     except Exception:
                         pass
         except Exception:
@@ -103,45 +149,47 @@ class XArmController:
         if self._arm is None:
             return False, "SDK not connected"
         try:
-            ok, msg = self._check(self._arm.set_mode(mode), ok_msg=f"mode={mode}", fail_msg="set_mode failed")
+            set_mode = self._sdk_set_mode or self._arm.set_mode
+            set_state = self._sdk_set_state or self._arm.set_state
+            ok, msg = self._check(set_mode(mode), ok_msg=f"mode={mode}", fail_msg="set_mode failed")
             if not ok:
                 return False, msg
-            ok, msg = self._check(self._arm.set_state(0), ok_msg="ready", fail_msg="set_state failed")
+            ok, msg = self._check(set_state(0), ok_msg="ready", fail_msg="set_state failed")
+            if ok:
+                self.state.current_mode = mode
             return ok, msg
         except Exception as e:  # Safety net
             return False, f"mode/state exception: {e}"
 
-    def _rpy_to_rot(self, rx: float, ry: float, rz: float, is_radian: bool) -> list[list[float]]:
+    @staticmethod
+    def _rpy_axis(rx: float, ry: float, rz: float, is_radian: bool, col: int) -> Tuple[float, float, float]:
         """
-        Compute a 3x3 rotation matrix from roll, pitch, yaw.
+        Compute one column of the RPY rotation matrix directly.
 
-        Uses intrinsic XYZ (Rx * Ry * Rz). Converts from degrees if needed.
+        Returns column `col` of Rz @ Ry @ Rx (extrinsic x->y->z) from the
+        closed-form expressions, computing only the sines/cosines that
+        column needs and without building the full 3x3 matrix.
 
         Args:
             rx: Roll.
             ry: Pitch.
             rz: Yaw.
             is_radian: True if angles are radians.
+            col: Column index (0, 1, or 2) as from `_tool_axis_col`.
 
         Returns:
-            list[list[float]]: 3x3 rotation matrix mapping tool frame to base.
+            Tuple[float, float, float]: The tool axis resolved in base frame.
         """
         if not is_radian:
             rx, ry, rz = math.radians(rx), math.radians(ry), math.radians(rz)
-        cx, sx = math.cos(rx), math.sin(rx)
         cy, sy = math.cos(ry), math.sin(ry)
         cz, sz = math.cos(rz), math.sin(rz)
-        # R = Rz * Ry * Rx (extrinsic) == Rx * Ry * Rz (intrinsic XYZ)
-        R00 = cz * cy
-        R01 = cz * sy * sx - sz * cx
-        R02 = cz * sy * cx + sz * sx
-        R10 = sz * cy
-        R11 = sz * sy * sx + cz * cx
-        R12 = sz * sy * cx - cz * sx
-        R20 = -sy
-        R21 = cy * sx
-        R22 = cy * cx
-        return [[R00, R01, R02], [R10, R11, R12], [R20, R21, R22]]
+        if col == 0:
+            return (cz * cy, sz * cy, -sy)
+        cx, sx = math.cos(rx), math.sin(rx)
+        if col == 1:
+            return (cz * sy * sx - sz * cx, sz * sy * sx + cz * cx, cy * sx)
+        return (cz * sy * cx + sz * sx, sz * sy * cx - cz * sx, cy * cx)
 
     @staticmethod
     def _tool_axis_col(axis: AxisLiteral) -> int:
@@ -188,10 +236,17 @@ class XArmController:
                 return f"Already connected to {self.state.ip}"
             try:
                 self._arm = XArmAPI(port=self.state.ip)
+                # Probe optional capabilities once per session
+                self._cap_err_warn = getattr(self._arm, "get_err_warn_code", None)
+                self._cap_clean_error = getattr(self._arm, "clean_error", None)
+                self._cap_clean_warn = getattr(self._arm, "clean_warn", None)
+                self._sdk_set_position = self._arm.set_position
+                self._sdk_set_mode = self._arm.set_mode
+                self._sdk_set_state = self._arm.set_state
+                self._sdk_get_position = self._arm.get_position
                 # Cache unit preference if available
                 try:
-                    if hasattr(self._arm, "is_radian"):
-                        self.state.is_radian = bool(getattr(self._arm, "is_radian"))
+                    self.state.is_radian = bool(getattr(self._arm, "is_radian", self.state.is_radian))
                 except Exception:
                     pass
                 # Prepare for motion
@@ -205,12 +260,14 @@ class XArmController:
                     return msg
                 # Query TCP linear velocity/acceleration if supported
                 try:
-                    if hasattr(self._arm, "get_tcp_maxlin_vel"):
-                        c_v, vmax = self._arm.get_tcp_maxlin_vel()  # type: ignore[attr-defined]
+                    get_maxlin_vel = getattr(self._arm, "get_tcp_maxlin_vel", None)
+                    if get_maxlin_vel is not None:
+                        c_v, vmax = get_maxlin_vel()
                         if c_v == 0 and vmax is not None:
                             self.state.max_tcp_lin_vel_mmps = float(vmax)
-                    if hasattr(self._arm, "get_tcp_maxlin_acc"):
-                        c_a, amax = self._arm.get_tcp_maxlin_acc()  # type: ignore[attr-defined]
+                    get_maxlin_acc = getattr(self._arm, "get_tcp_maxlin_acc", None)
+                    if get_maxlin_acc is not None:
+                        c_a, amax = get_maxlin_acc()
                         if c_a == 0 and amax is not None:
                             self.state.max_tcp_lin_acc_mmps2 = float(amax)
                 except Exception:
@@ -223,11 +280,13 @@ class XArmController:
                 except Exception:
                     pass
                 self.state.connected = True
+                self._connected_event.set()
                 self.state.last_error = "Connected"
                 return f"Connected to {self.state.ip}"
             except Exception as e:
                 self._arm = None
                 self.state.connected = False
+                self._connected_event.clear()
                 self.state.last_error = f"Connect failed: {e}"
                 return self.state.last_error
 
@@ -238,17 +297,29 @@ class XArmController:
         Returns:
             str: Status string describing the result of the operation.
         """
-        # Phase 1: stop outside to avoid holding lock during join
+        # Phase 1: stop outside to avoid holding lock during the idle wait
         self.stop_motion()
         with self._lock:
             try:
+                if self._worker is not None:
+                    self._jobs.put(None)
+                    self._worker = None
                 if self._arm is not None:
                     try:
                         self._arm.disconnect()
                     finally:
                         self._arm = None
+                        self._cap_err_warn = None
+                        self._cap_clean_error = None
+                        self._cap_clean_warn = None
+                        self._sdk_set_position = None
+                        self._sdk_set_mode = None
+                        self._sdk_set_state = None
+                        self._sdk_get_position = None
                 self.state.connected = False
+                self._connected_event.clear()
                 self.state.teach_enabled = False
+                self.state.current_mode = -1
                 self.state.last_error = "Disconnected"
                 return "Disconnected"
             except Exception as e:
@@ -263,18 +334,11 @@ class XArmController:
         Returns:
             Tuple[str, str]: (status_text, draggable_label) for UI display.
         """
-        with self._lock:
-            if not self.state.connected or self._arm is None:
-                return ("Not connected", "Not Draggable")
-            try:
-                if self.state.playing:
-                    # Stop current motion before switching modes
-                    # Do not block the UI in the lock; signal and exit
-                    pass
-            except Exception:
-                pass
+        # Lock-free pre-checks; connection/playing flags are Events
+        if not self._connected_event.is_set():
+            return ("Not connected", "Not Draggable")
         # Stop motion outside lock
-        if self.state.playing:
+        if self._playing_event.is_set():
             self.stop_motion()
         with self._lock:
             try:
@@ -300,71 +364,58 @@ class XArmController:
                 return (self.state.last_error, "Not Draggable")
 
     # -------------------- Point‑to‑Point Motion --------------------
-    def _p2p_loop(self, amp_mm: float, speed_percent: float, accel_percent: float, axis: AxisLiteral) -> None:
+    def _worker_loop(self) -> None:
+        """Run queued motion jobs until the None sentinel arrives."""
+        for job in iter(self._jobs.get, None):
+            self._loop_idle.clear()
+            try:
+                self._p2p_loop(*job)
+            except Exception:
+                pass
+            finally:
+                self._loop_idle.set()
+
+    def _p2p_loop(self, endpoints: np.ndarray, v_target: float, a_target: float, dt: float) -> None:
         """
-        Bounce between two endpoints along the selected tool axis.
+        Bounce between two precomputed endpoints until stopped.
 
-        Endpoints are computed by taking the saved center pose and applying a
-        tool-frame offset of [±amp/2, 0, 0], [0, ±amp/2, 0], or [0, 0, ±amp/2]
-        depending on `axis`, transformed into base coordinates via the current
-        RPY. The orientation is held constant.
+        All setup (endpoint math, percentage clamping, jerk configuration)
+        is done by `play_point_to_point`; this loop only queues alternating
+        non-blocking moves paced by the stop event.
 
         Args:
-            amp_mm: Peak-to-peak amplitude in millimeters.
-            speed_percent: 0–100% of max TCP linear speed.
-            accel_percent: 0–100% of max TCP linear acceleration.
-            axis: Tool axis for motion. One of "x", "y", "z".
+            endpoints: C-contiguous (2, 6) array of [low, high] endpoint
+                poses (x, y, z, rx, ry, rz).
+            v_target: Target TCP linear speed in mm/s.
+            a_target: Target TCP linear acceleration in mm/s^2.
+            dt: Estimated segment duration in seconds used to pace the flips.
         """
         assert self._arm is not None
-        vmax = float(self.state.max_tcp_lin_vel_mmps) * SPEED_MULTIPLIER
-        amax = float(self.state.max_tcp_lin_acc_mmps2) * ACCEL_MULTIPLIER
-
-        pct_v = max(0.0, min(100.0, speed_percent)) / 100.0
-        pct_a = max(0.0, min(100.0, accel_percent)) / 100.0
-        #v_target = max(1.0, pct_v * vmax)
-        #a_target = max(10.0, pct_a * amax)
-        v_target = pct_v * vmax
-        a_target = pct_a * amax
-        
-        # Endpoints around the saved center pose, along selected tool axis resolved in base
-        pose = list(self.state.init_pose or [])
-        if not pose or len(pose) < 6:
-            return
-        x, y, z, rx, ry, rz = pose
-
-        # Determine unit mode for angles
-        if hasattr(self._arm, "is_radian"):
-            try:
-                is_radian = bool(getattr(self._arm, "is_radian"))
-            except Exception:
-                is_radian = self.state.is_radian
-        else:
-            is_radian = self.state.is_radian
-
-        R = self._rpy_to_rot(rx, ry, rz, is_radian)
-        col = self._tool_axis_col(axis)
-        # tool axis in base = selected column of rotation matrix
-        fx, fy, fz = R[0][col], R[1][col], R[2][col]
-        norm = max(1e-9, (fx * fx + fy * fy + fz * fz) ** 0.5)
-        fx, fy, fz = fx / norm, fy / norm, fz / norm
-        half = max(0.0, amp_mm) / 2.0
-        p_low = [x - fx * half, y - fy * half, z - fz * half, rx, ry, rz]
-        p_high = [x + fx * half, y + fy * half, z + fz * half, rx, ry, rz]
-
-        self._arm.set_tcp_jerk(50000)
-
-        current_target_high = True
-        while not self._stop_event.is_set():
-            target = p_high if current_target_high else p_low
-            try:
+        # Pre-bind the per-iteration callables; this loop is the module's
+        # only long-running Python path, so repeated attribute lookups
+        # matter here.
+        set_position = self._sdk_set_position or self._arm.set_position
+        stop_is_set = self._stop_event.is_set
+        stop_wait = self._stop_event.wait
+        idx = 1  # start toward the high endpoint
+        # One try frame around the whole loop instead of per iteration; an
+        # SDK failure exits the loop either way. Flushing the in-flight
+        # queued move is stop_motion's job (set_state(4) there), so the loop
+        # just exits and lets the idle event report completion.
+        try:
+            while not stop_is_set():
+                row = endpoints[idx]
                 # set_position accepts speed and mvacc per SDK
-                self._arm.set_position(
-                    target[0], target[1], target[2], target[3], target[4], target[5],
-                    speed=v_target, mvacc=a_target, wait=True
-                )
-            except Exception:
-                break
-            current_target_high = not current_target_high
+                set_position(row[0], row[1], row[2], row[3], row[4], row[5],
+                             speed=v_target, mvacc=a_target, wait=False)
+                # Wait slightly less than the segment so the next move is
+                # queued before the previous one ends; a stop fires within
+                # this slice
+                if stop_wait(dt * 0.95):
+                    break
+                idx ^= 1
+        except Exception:
+            pass
 
     def play_point_to_point(self, amplitude_cm: float, speed_percent: float, accel_percent: float, axis: AxisLiteral = "z") -> str:
         """
@@ -383,35 +434,102 @@ class XArmController:
             str: Status string for UI.
         """
         with self._lock:
-            if not self.state.connected or self._arm is None:
+            if not self._connected_event.is_set() or self._arm is None:
                 return "Not connected"
-            if self.state.playing:
+            if self._playing_event.is_set():
                 return "Already playing"
             try:
                 # Save center pose
-                code, pose = self._arm.get_position()
+                code, pose = self._sdk_get_position()
                 if code != 0 or pose is None:
                     return f"Failed to read TCP pose (code {code})"
-                self.state.init_pose = list(pose)
+                # Fixed-size typed buffer: cheap to copy and consumed by the
+                # endpoint math without conversion
+                self.state.init_pose = np.asarray(pose[:6], dtype=np.float64)
 
                 # Ensure we are in position mode and ready
                 ok, msg = self._set_mode_and_ready(0)
                 if not ok:
                     return f"Failed to enter position mode: {msg}"
 
+                # All motion setup happens here so the loop thread is purely
+                # iterative: clamp percentages into targets ...
+                vmax = float(self.state.max_tcp_lin_vel_mmps) * SPEED_MULTIPLIER
+                amax = float(self.state.max_tcp_lin_acc_mmps2) * ACCEL_MULTIPLIER
+                pct_v = max(0.0, min(100.0, float(speed_percent))) / 100.0
+                pct_a = max(0.0, min(100.0, float(accel_percent))) / 100.0
+                v_target = pct_v * vmax
+                a_target = pct_a * amax
+                amp_mm = max(0.0, min(200.0, float(amplitude_cm) * 10.0))
+
+                # ... and build both endpoints around the saved center pose,
+                # along the selected tool axis resolved in base frame.
+                # Resolve angle units once; they cannot change mid-motion.
+                is_radian = bool(getattr(self._arm, "is_radian", self.state.is_radian))
+                center = self.state.init_pose
+                rx, ry, rz = center[3:6]
+                col = self._tool_axis_col(axis)
+                eps = 1e-4 if is_radian else 1e-2
+                if abs(rx) < eps and abs(ry) < eps:
+                    # Fast path: tool frame only yawed relative to base, so
+                    # the tool z axis is base z and the x/y axes are base
+                    # axes rotated by yaw - no full rotation needed
+                    if col == 2:
+                        axis_vec = np.array([0.0, 0.0, 1.0])
+                    else:
+                        rz_rad = rz if is_radian else math.radians(rz)
+                        cz, sz = math.cos(rz_rad), math.sin(rz_rad)
+                        if col == 0:
+                            axis_vec = np.array([cz, sz, 0.0])
+                        else:
+                            axis_vec = np.array([-sz, cz, 0.0])
+                elif _KERNEL_COMPILED:
+                    # Single compiled kernel: RPY, column selection,
+                    # normalization and both offsets in one GIL-free call
+                    axis_vec = None
+                elif _Rotation is not None:
+                    # SciPy's compiled euler conversion; lowercase "xyz" is
+                    # extrinsic x->y->z, i.e. Rz @ Ry @ Rx, matching
+                    # _rpy_axis and the compiled kernel
+                    axis_vec = _Rotation.from_euler(
+                        "xyz", (rx, ry, rz), degrees=not is_radian
+                    ).as_matrix()[:, col]
+                else:
+                    axis_vec = np.array(self._rpy_axis(rx, ry, rz, is_radian, col))
+                if axis_vec is None:
+                    endpoints = _compute_endpoints(
+                        center[0], center[1], center[2], rx, ry, rz,
+                        is_radian, col, amp_mm / 2.0,
+                    )
+                else:
+                    axis_vec /= max(1e-9, float(np.linalg.norm(axis_vec)))
+                    delta = (amp_mm / 2.0) * axis_vec
+                    # Both endpoints as one C-contiguous (2, 6) table indexed
+                    # by the loop's flip bit; no per-iteration allocation
+                    endpoints = np.stack([center, center])
+                    endpoints[0, :3] -= delta
+                    endpoints[1, :3] += delta
+                    endpoints = np.ascontiguousarray(endpoints, dtype=np.float64)
+                # Estimated segment duration paces the loop; floor keeps a
+                # zero-amplitude request from spinning
+                dt = max(0.05, amp_mm / max(1.0, v_target))
+
+                self._arm.set_tcp_jerk(50000)
+
                 self._stop_event.clear()
                 self.state.playing = True
+                self._playing_event.set()
                 self.state.last_play_speed_pct = float(max(0.0, min(100.0, speed_percent)))
-                amp_mm = max(0.0, min(200.0, float(amplitude_cm) * 10.0))
-                self._motion_thread = threading.Thread(
-                    target=self._p2p_loop,
-                    args=(amp_mm, float(speed_percent), float(accel_percent), axis),
-                    daemon=True,
-                )
-                self._motion_thread.start()
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._worker_loop, name="p2p-motion", daemon=True
+                    )
+                    self._worker.start()
+                self._jobs.put((endpoints, v_target, a_target, dt))
                 return "Point-to-point motion started"
             except Exception as e:
                 self.state.playing = False
+                self._playing_event.clear()
                 self.state.last_error = f"Play error: {e}"
                 return self.state.last_error
 
@@ -422,28 +540,47 @@ class XArmController:
         Returns:
             str: Human-readable status string for the UI.
         """
-        # Phase 1: signal stop and extract thread under lock
-        thread: Optional[threading.Thread] = None
+        # Phase 1: signal stop under lock
+        if not self._connected_event.is_set():
+            return "Not connected"
         with self._lock:
-            if not self.state.connected or self._arm is None:
+            if self._arm is None:
                 return "Not connected"
             try:
-                if self.state.playing:
+                if self._playing_event.is_set():
                     self._stop_event.set()
-                    thread = self._motion_thread
                 self.state.playing = False
+                self._playing_event.clear()
             except Exception as e:
                 self.state.last_error = f"Stop error: {e}"
                 return self.state.last_error
-        # Phase 2: join without holding the lock
-        if thread and thread.is_alive():
-            thread.join(timeout=2.0)
+        # Phase 2: wait for the worker to go idle without holding the lock.
+        # The loop normally exits within one wait slice of the stop event,
+        # but a set_position stalled on the network can hold the worker up;
+        # wait generously so its last call can't land after the
+        # return-to-pose below (extra margin for GIL contention on standard
+        # builds)
+        self._loop_idle.wait(timeout=1.0 if _FREE_THREADED else 2.0)
         # Phase 3: finish shutdown under lock
         with self._lock:
             try:
-                # Ensure controller is in position mode after stopping
+                # Flush any queued non-blocking moves, then bring the
+                # controller back to position mode and ready state. When the
+                # arm never left mode 0, skip the redundant mode round-trip
+                # and only re-ready the state after the flush.
                 if self._arm is not None:
-                    self._set_mode_and_ready(0)
+                    set_state = self._sdk_set_state or self._arm.set_state
+                    try:
+                        set_state(4)
+                    except Exception:
+                        pass
+                    if self.state.current_mode != 0:
+                        self._set_mode_and_ready(0)
+                    else:
+                        try:
+                            set_state(0)
+                        except Exception:
+                            pass
 
                 # If we have a saved pose, return to it in position mode
                 if self._arm is not None and self.state.init_pose is not None:
@@ -451,8 +588,9 @@ class XArmController:
                     pct = max(0.0, min(100.0, self.state.last_play_speed_pct)) / 100.0
                     ret_speed = max(20.0, min(vmax, vmax * pct))  # mm/s
 
-                    x, y, z, rx, ry, rz = list(self.state.init_pose)
-                    code = self._arm.set_position(x, y, z, rx, ry, rz, speed=ret_speed, wait=True)
+                    x, y, z, rx, ry, rz = self.state.init_pose.tolist()
+                    set_position = self._sdk_set_position or self._arm.set_position
+                    code = set_position(x, y, z, rx, ry, rz, speed=ret_speed, wait=True)
                     ok, msg = self._check(code, ok_msg="returned", fail_msg="set_position failed")
                     if not ok:
                         return f"Stopped, return pose error: {msg}"